@@ -5,28 +5,54 @@ This module contains all API endpoints related to product operations
 including upload, CRUD operations, and bulk operations.
 """
 
+import os
 import uuid
+import tempfile
 import asyncio
 import logging
-from typing import Optional
+from typing import Dict, Optional
 from concurrent.futures import ThreadPoolExecutor
 
-from fastapi import APIRouter, File, UploadFile, Depends, HTTPException, Request, Form
-from fastapi.responses import HTMLResponse, StreamingResponse
+import aiofiles
+import orjson
+from cachetools import TTLCache
+from fastapi import (
+    APIRouter, BackgroundTasks, File, UploadFile, Depends, HTTPException, Request, Form
+)
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
 
 from app.models import get_db, Product
-from app.services import ProductService
+from app.services import ProductService, TaskProgress
+from app.api.webhooks import dispatch_event
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 templates = Jinja2Templates(directory="templates")
+# Persist compiled templates across workers; skip mtime checks in production
+templates.env.bytecode_cache = FileSystemBytecodeCache()
+templates.env.auto_reload = os.getenv("TEMPLATE_AUTO_RELOAD", "1") == "1"
 
 # Global storage for async operations
-progress_store = {}
+progress_store: Dict[str, TaskProgress] = {}
+progress_channels: Dict[str, "ProgressChannel"] = {}
 cancel_flags = {}
-executor = ThreadPoolExecutor(max_workers=2)
+# Seconds a finished task's progress stays readable before it is dropped
+PROGRESS_RETENTION_SECONDS = 300
+# Import workers; parsing and DB writes mostly release the GIL
+IMPORT_WORKERS = int(os.getenv("IMPORT_WORKERS", min(4, os.cpu_count() or 1)))
+executor = ThreadPoolExecutor(max_workers=IMPORT_WORKERS)
+
+# Upload chunk size; bounds peak memory per upload regardless of file size
+UPLOAD_CHUNK_SIZE = 1 << 20
+# Seconds of SSE silence before a keepalive comment is sent to proxies
+SSE_KEEPALIVE_INTERVAL = 15
+
+# Rendered /products pages keyed by (page, search, active); cleared on writes
+products_page_cache = TTLCache(maxsize=256, ttl=5)
 
 
 @router.get("/", response_class=HTMLResponse)
@@ -43,6 +69,103 @@ async def home(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 
+class ProgressChannel:
+    """
+    Latest progress snapshot of a task, with a wakeup for SSE subscribers.
+    
+    Only the newest snapshot is kept, so memory stays bounded however
+    slowly subscribers read, and every subscriber sees the final state.
+    Must only be used from the event loop thread.
+    """
+    
+    def __init__(self):
+        self.snapshot: Optional[dict] = None
+        self.changed = asyncio.Event()
+    
+    def publish(self, snapshot: dict):
+        """
+        Replace the snapshot and wake every waiting subscriber.
+        
+        Args:
+            snapshot (dict): Progress payload
+        """
+        self.snapshot = snapshot
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+
+def _publish_progress(task_id: str, **fields):
+    """
+    Update a task's progress record and publish a snapshot to subscribers.
+    
+    Must be called from the event loop thread.
+    
+    Args:
+        task_id (str): Task identifier
+        **fields: TaskProgress attributes to update
+    """
+    task = progress_store.setdefault(task_id, TaskProgress())
+    for name, value in fields.items():
+        setattr(task, name, value)
+    channel = progress_channels.get(task_id)
+    if channel is not None:
+        channel.publish(task.snapshot())
+
+
+def _finish_task(task_id: str, future: asyncio.Future):
+    """
+    Settle a task once its import worker has returned.
+    
+    The importer marks every outcome finished itself; this is a backstop
+    so SSE subscribers never wait on a task that can no longer progress.
+    The final state stays readable for PROGRESS_RETENTION_SECONDS, for
+    late subscribers and /task polls.
+    
+    Args:
+        task_id (str): Task identifier
+        future (asyncio.Future): Finished import future
+    """
+    task = progress_store.get(task_id)
+    if task is not None and not task.completed:
+        if cancel_flags.get(task_id, False):
+            _publish_progress(
+                task_id, progress=0, status="Cancelled by user",
+                completed=True, cancelled=True
+            )
+        else:
+            error = None if future.cancelled() else future.exception()
+            _publish_progress(
+                task_id, progress=0, status=f"Error: {error or 'import stopped'}",
+                completed=True, error=True
+            )
+    asyncio.get_running_loop().call_later(PROGRESS_RETENTION_SECONDS, _forget_task, task_id)
+
+
+def _forget_task(task_id: str):
+    """
+    Drop a finished task's progress, subscriber channel and cancel flag.
+    
+    Args:
+        task_id (str): Task identifier
+    """
+    progress_store.pop(task_id, None)
+    progress_channels.pop(task_id, None)
+    cancel_flags.pop(task_id, None)
+
+
+def _remove_file(file_path: str):
+    """
+    Remove a temporary upload file if it still exists.
+    
+    Args:
+        file_path (str): Path to remove
+    """
+    try:
+        os.unlink(file_path)
+    except FileNotFoundError:
+        pass
+
+
 @router.post("/upload-direct")
 async def upload_file_direct(file: UploadFile = File(...)):
     """
@@ -61,40 +184,50 @@ async def upload_file_direct(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail="Only CSV files allowed")
     
     task_id = str(uuid.uuid4())
-    progress_store[task_id] = {
-        "progress": 0, 
-        "status": "Starting...", 
-        "completed": False
-    }
+    loop = asyncio.get_running_loop()
+    channel = ProgressChannel()
+    progress_channels[task_id] = channel
+    _publish_progress(task_id, status="Starting...")
+    
+    # Unique path so concurrent uploads of the same filename can't collide
+    fd, file_path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
     
     try:
-        content = await file.read()
+        # Stream to disk in chunks instead of buffering the whole file
+        async with aiofiles.open(file_path, 'wb') as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await f.write(chunk)
         
-        # Save temporarily
-        file_path = f"/tmp/{file.filename}"
-        with open(file_path, 'wb') as f:
-            f.write(content)
+        # Start async processing; the worker hands updates back to the loop
+        def notify(data: dict):
+            loop.call_soon_threadsafe(channel.publish, data)
         
-        # Start async processing
-        loop = asyncio.get_event_loop()
-        loop.run_in_executor(
+        future = loop.run_in_executor(
             executor, 
             ProductService.import_products_from_csv,
             file_path, 
             task_id, 
             progress_store, 
-            cancel_flags
+            cancel_flags,
+            notify
         )
+        future.add_done_callback(lambda _: _remove_file(file_path))
+        future.add_done_callback(lambda _: products_page_cache.clear())
+        future.add_done_callback(lambda done: _finish_task(task_id, done))
         
         return {"status": "processing", "task_id": task_id}
         
     except Exception as e:
-        progress_store[task_id] = {
-            "progress": 0,
-            "status": f"Error: {str(e)}",
-            "completed": True,
-            "error": True
-        }
+        _remove_file(file_path)
+        _publish_progress(
+            task_id,
+            progress=0,
+            status=f"Error: {str(e)}",
+            completed=True,
+            error=True
+        )
+        loop.call_later(PROGRESS_RETENTION_SECONDS, _forget_task, task_id)
         logger.error(f"Upload failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
@@ -111,16 +244,26 @@ async def get_progress_stream(task_id: str):
         StreamingResponse: SSE stream with progress updates
     """
     async def event_stream():
-        while task_id in progress_store:
-            data = progress_store[task_id]
-            import json
-            yield f"data: {json.dumps(data)}\n\n"
-            if data.get('completed'):
-                await asyncio.sleep(1)
-                if task_id in progress_store:
-                    del progress_store[task_id]
-                break
-            await asyncio.sleep(0.5)
+        channel = progress_channels.get(task_id)
+        if channel is None:
+            return
+        
+        # Updates are published by the import worker; send the latest one,
+        # skipping any that arrived while the client was still reading
+        sent = None
+        while True:
+            changed = channel.changed
+            data = channel.snapshot
+            if data is not None and data is not sent:
+                sent = data
+                yield b"data: " + orjson.dumps(data) + b"\n\n"
+                if data.get('completed'):
+                    break
+                continue
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=SSE_KEEPALIVE_INTERVAL)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
     
     return StreamingResponse(
         event_stream(), 
@@ -133,12 +276,16 @@ async def get_progress_stream(task_id: str):
 
 
 @router.get("/task/{task_id}")
-async def get_task_status(task_id: str):
+async def get_task_status(task_id: str, response: Response):
     """
-    Get task status for progress polling.
+    Get a single task status snapshot.
+    
+    Fallback for clients without EventSource support; the UI subscribes
+    to /progress/{task_id} instead of polling this endpoint.
     
     Args:
         task_id (str): Task identifier
+        response (Response): Outgoing response, for cache headers
         
     Returns:
         dict: Task status and progress information
@@ -146,30 +293,31 @@ async def get_task_status(task_id: str):
     if task_id not in progress_store:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    data = progress_store[task_id]
+    task = progress_store[task_id]
+    response.headers["Cache-Control"] = "no-store"
     
     # Convert to Celery-like format for compatibility
-    if data.get('completed'):
-        if 'error' in data:
+    if task.completed:
+        if task.error:
             return {
                 "state": "FAILURE",
-                "result": data.get('error', 'Unknown error')
+                "result": task.status or 'Unknown error'
             }
         else:
             return {
                 "state": "SUCCESS",
                 "result": {
-                    "imported": data.get('imported', 0),
-                    "total": data.get('total', 0)
+                    "imported": task.imported,
+                    "total": task.total
                 }
             }
     else:
         return {
             "state": "PROGRESS",
-            "progress": data.get('progress', 0),
-            "current": data.get('current', 0),
-            "total": data.get('total', 0),
-            "status": data.get('status', 'Processing...')
+            "progress": task.progress,
+            "current": task.current,
+            "total": task.total,
+            "status": task.status or 'Processing...'
         }
 
 
@@ -186,7 +334,7 @@ async def cancel_task(task_id: str):
     """
     cancel_flags[task_id] = True
     if task_id in progress_store:
-        progress_store[task_id]["status"] = "Cancelling..."
+        _publish_progress(task_id, status="Cancelling...")
     return {"status": "cancelled"}
 
 
@@ -211,6 +359,11 @@ async def get_products(
     Returns:
         HTMLResponse: Rendered products page
     """
+    cache_key = (page, search or "", active or "")
+    content = products_page_cache.get(cache_key)
+    if content is not None:
+        return HTMLResponse(content=content)
+    
     result = ProductService.get_products_paginated(
         db=db, 
         page=page, 
@@ -218,16 +371,19 @@ async def get_products(
         active=active
     )
     
-    return templates.TemplateResponse("products.html", {
+    response = templates.TemplateResponse("products.html", {
         "request": request,
         **result,
         "search": search or "",
         "active": active
     })
+    products_page_cache[cache_key] = response.body
+    return response
 
 
 @router.post("/products")
 async def create_product(
+    background_tasks: BackgroundTasks,
     name: str = Form(...),
     sku: str = Form(...),
     description: str = Form(""),
@@ -243,13 +399,16 @@ async def create_product(
             description=description,
             active=active
         )
-        return {
+        result = {
             "id": product.id,
             "name": product.name,
             "sku": product.sku,
             "description": product.description,
             "active": product.active
         }
+        products_page_cache.clear()
+        background_tasks.add_task(dispatch_event, "product.created", result)
+        return result
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -257,6 +416,7 @@ async def create_product(
 @router.put("/products/{product_id}")
 async def update_product(
     product_id: int,
+    background_tasks: BackgroundTasks,
     name: str = Form(...),
     sku: str = Form(...),
     description: str = Form(""),
@@ -276,13 +436,16 @@ async def update_product(
         if not product:
             raise HTTPException(status_code=404, detail="Product not found")
         
-        return {
+        result = {
             "id": product.id,
             "name": product.name,
             "sku": product.sku,
             "description": product.description,
             "active": product.active
         }
+        products_page_cache.clear()
+        background_tasks.add_task(dispatch_event, "product.updated", result)
+        return result
     except HTTPException:
         raise
     except ValueError as e:
@@ -293,12 +456,18 @@ async def update_product(
 
 
 @router.delete("/products/{product_id}")
-async def delete_product(product_id: int, db: Session = Depends(get_db)):
+async def delete_product(
+    product_id: int,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
     """Delete a product."""
     try:
         success = ProductService.delete_product(db=db, product_id=product_id)
         if not success:
             raise HTTPException(status_code=404, detail="Product not found")
+        products_page_cache.clear()
+        background_tasks.add_task(dispatch_event, "product.deleted", {"id": product_id})
         return {"message": "Product deleted successfully"}
     except HTTPException:
         raise
@@ -325,6 +494,7 @@ async def delete_all_products_direct(db: Session = Depends(get_db)):
         logger.info(f"Direct delete all products requested - Current count: {count}")
         
         deleted = ProductService.delete_all_products(db)
+        products_page_cache.clear()
         
         return {
             "status": "completed", 
@@ -347,8 +517,11 @@ async def get_status(db: Session = Depends(get_db)):
     Returns:
         dict: Database status information
     """
-    total_products = db.query(Product).count()
-    active_products = db.query(Product).filter(Product.active == True).count()
+    # Single scan for both counts
+    total_products, active_products = db.query(
+        func.count(Product.id),
+        func.coalesce(func.sum(case((Product.active == True, 1), else_=0)), 0)
+    ).one()
     inactive_products = total_products - active_products
     
     logger.info(f"Database status - Total: {total_products}, Active: {active_products}, Inactive: {inactive_products}")
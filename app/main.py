@@ -5,11 +5,14 @@ This module creates and configures the FastAPI application with all routes,
 middleware, and dependencies.
 """
 
+import os
 import logging
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
 from app.api import products_router, webhooks_router
+from app.api.webhooks import http_client
+from app.models import init_db
 
 # Configure logging
 logging.basicConfig(
@@ -39,12 +42,15 @@ app.include_router(webhooks_router, tags=["webhooks"])
 async def startup_event():
     """Application startup event handler."""
     logger.info("Product Importer application starting up...")
+    if os.getenv("APP_RUN_MIGRATIONS", "1") == "1":
+        init_db()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown event handler."""
     logger.info("Product Importer application shutting down...")
+    await http_client.aclose()
 
 
 if __name__ == "__main__":
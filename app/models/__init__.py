@@ -1,5 +1,5 @@
 """Database models package."""
 
-from .database import Product, Webhook, get_db, SessionLocal, Base
+from .database import Product, Webhook, get_db, get_engine, init_db, SessionLocal, Base
 
-__all__ = ["Product", "Webhook", "get_db", "SessionLocal", "Base"]
+__all__ = ["Product", "Webhook", "get_db", "get_engine", "init_db", "SessionLocal", "Base"]
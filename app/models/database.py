@@ -5,17 +5,109 @@ This module contains SQLAlchemy models for products and webhooks,
 along with database session management.
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, create_engine
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, create_engine, event, select
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
+from functools import lru_cache
+import logging
 import os
+import sqlite3
+
+logger = logging.getLogger(__name__)
 
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./products.db")
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Connection pool sizing (ignored for SQLite, which manages its own pool)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+
+# FTS5's trigram tokenizer, which supports substring search, needs SQLite 3.34
+SQLITE_TRIGRAM_SEARCH = sqlite3.sqlite_version_info >= (3, 34, 0)
+
+# External-content FTS5 table over products, kept in sync by triggers
+SQLITE_SEARCH_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+        name, sku, description,
+        content='products', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_insert AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, name, sku, description)
+        VALUES (new.id, new.name, new.sku, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_delete AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, sku, description)
+        VALUES ('delete', old.id, old.name, old.sku, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_update AFTER UPDATE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, sku, description)
+        VALUES ('delete', old.id, old.name, old.sku, old.description);
+        INSERT INTO products_fts(rowid, name, sku, description)
+        VALUES (new.id, new.name, new.sku, new.description);
+    END""",
+]
+
+# Trigram GIN indexes let PostgreSQL serve ILIKE '%term%' without a scan
+POSTGRES_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_products_name_trgm ON products USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_products_sku_trgm ON products USING gin (sku gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_products_description_trgm ON products USING gin (description gin_trgm_ops)",
+]
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> Engine:
+    """
+    Get the process-wide database engine.
+    
+    Returns:
+        Engine: SQLAlchemy engine, created on first call
+    """
+    url = make_url(DATABASE_URL)
+    options = {"pool_pre_ping": True}
+    if url.get_backend_name() != "sqlite":
+        options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW)
+    if url.get_driver_name() == "psycopg2":
+        # Rewrite executemany INSERTs as multi-row VALUES pages and batch
+        # the remaining UPDATE/DELETE executemany calls
+        options.update(
+            executemany_mode="values_plus_batch",
+            insertmanyvalues_page_size=10000,
+            executemany_batch_page_size=1000,
+        )
+    engine = create_engine(DATABASE_URL, **options)
+    if url.get_backend_name() == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Configure each new SQLite connection for bulk writes.
+    
+    WAL lets readers run alongside an import, and synchronous=NORMAL only
+    fsyncs at checkpoints instead of on every commit.
+    
+    Args:
+        dbapi_connection: Raw sqlite3 connection
+        connection_record: Pool record for the connection
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+engine = get_engine()
+# Sessions are request-scoped, so objects stay readable after commit
+# without a SELECT to reload what was just written
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
 Base = declarative_base()
 
 
@@ -44,6 +136,51 @@ class Product(Base):
         return f"<Product(id={self.id}, sku='{self.sku}', name='{self.name}')>"
 
 
+def _create_search_index(target, connection, **kw) -> None:
+    """
+    Create the trigram index backing product search, if it is missing.
+    
+    Args:
+        target: Products table
+        connection: Connection the table was created on
+    """
+    dialect = connection.dialect.name
+    if dialect == "sqlite" and SQLITE_TRIGRAM_SEARCH:
+        exists = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE name = 'products_fts'"
+        ).first()
+        if exists:
+            return
+        for statement in SQLITE_SEARCH_DDL:
+            connection.exec_driver_sql(statement)
+        # Index rows that were stored before the table existed
+        connection.exec_driver_sql("INSERT INTO products_fts(products_fts) VALUES ('rebuild')")
+    elif dialect == "postgresql":
+        try:
+            with connection.begin_nested():
+                for statement in POSTGRES_SEARCH_DDL:
+                    connection.exec_driver_sql(statement)
+        except DBAPIError as e:
+            # Search still works without the indexes, just by scanning
+            logger.warning(f"Skipping trigram search indexes: {e.orig}")
+
+
+def _drop_search_index(target, connection, **kw) -> None:
+    """
+    Drop the SQLite search table along with products.
+    
+    Args:
+        target: Products table
+        connection: Connection the table is dropped on
+    """
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("DROP TABLE IF EXISTS products_fts")
+
+
+event.listen(Product.__table__, "after_create", _create_search_index)
+event.listen(Product.__table__, "before_drop", _drop_search_index)
+
+
 class Webhook(Base):
     """
     Webhook model for storing webhook configurations.
@@ -67,10 +204,27 @@ class Webhook(Base):
         return f"<Webhook(id={self.id}, url='{self.url}', event='{self.event_type}')>"
 
 
-def get_db():
+class SchemaMigration(Base):
+    """
+    Record of a one-off data migration already applied by init_db.
+    
+    Attributes:
+        name (str): Migration name
+        applied_at (datetime): When the migration ran
+    """
+    __tablename__ = "schema_migrations"
+    
+    name = Column(String, primary_key=True)
+    applied_at = Column(DateTime, default=datetime.utcnow)
+
+
+async def get_db():
     """
     Dependency function to get database session.
     
+    Declared async so FastAPI resolves it on the event loop instead of
+    sending every request through the thread pool just to build a session.
+    
     Yields:
         Session: SQLAlchemy database session
     """
@@ -81,5 +235,74 @@ def get_db():
         db.close()
 
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+def _lowercase_skus(connection) -> None:
+    """
+    Lowercase SKUs stored before all writes normalized them.
+    
+    Imports and SKU checks compare SKUs with plain equality against the
+    unique index, which relies on stored SKUs being lowercase. Where legacy
+    SKUs differ only by case, the oldest row of the group is lowercased so
+    the SKU still dedups; the others are logged for manual cleanup.
+    
+    Args:
+        connection: Connection to run the backfill on
+    """
+    # The derived table lets MySQL read products while updating it
+    result = connection.exec_driver_sql("""
+        UPDATE products SET sku = LOWER(sku)
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT MIN(id) AS id FROM products
+                GROUP BY LOWER(sku)
+                HAVING SUM(CASE WHEN sku = LOWER(sku) THEN 1 ELSE 0 END) = 0
+            ) AS first_rows
+        )
+    """)
+    if result.rowcount:
+        logger.info(f"Lowercased {result.rowcount} stored SKUs")
+    
+    leftover = connection.exec_driver_sql(
+        "SELECT id, sku FROM products WHERE sku <> LOWER(sku) ORDER BY id"
+    ).all()
+    if leftover:
+        logger.warning(
+            f"{len(leftover)} products have a SKU that differs only by case from "
+            f"another product and were left unchanged: "
+            + ", ".join(f"{row.id}:{row.sku}" for row in leftover[:20])
+            + (" ..." if len(leftover) > 20 else "")
+        )
+
+
+def _run_once(connection, name: str, migration) -> None:
+    """
+    Apply a data migration unless an earlier startup already recorded it.
+    
+    The migration and its marker row share the caller's transaction, so a
+    failed migration is retried on the next startup.
+    
+    Args:
+        connection: Connection to run the migration on
+        name (str): Unique migration name
+        migration: Callable taking the connection
+    """
+    table = SchemaMigration.__table__
+    if connection.execute(select(table.c.name).where(table.c.name == name)).first():
+        return
+    migration(connection)
+    connection.execute(table.insert().values(name=name))
+    logger.info(f"Applied migration {name}")
+
+
+def init_db():
+    """
+    Create any missing tables and bring existing ones up to date.
+    
+    Called once from application startup rather than at import, so worker
+    processes and reloads that import the models don't repeat it.
+    """
+    engine = get_engine()
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        _run_once(connection, "lowercase_skus", _lowercase_skus)
+        # Tables created before search indexing existed don't get the create hook
+        _create_search_index(Product.__table__, connection)
@@ -1,5 +1,5 @@
 """Services package containing business logic."""
 
-from .product_service import ProductService
+from .product_service import ProductService, TaskProgress
 
-__all__ = ["ProductService"]
+__all__ = ["ProductService", "TaskProgress"]
@@ -5,26 +5,85 @@ This module handles product import, CRUD operations, and related business logic.
 """
 
 import pandas as pd
-import os
+import pyarrow as pa
+from pyarrow import csv as pacsv
+import csv
+import io
 import logging
-from typing import Dict, List, Optional, Set
-from sqlalchemy import text
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from functools import lru_cache
+from itertools import chain, repeat
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
 from app.models import Product, SessionLocal
+from app.models.database import SQLITE_TRIGRAM_SEARCH
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class TaskProgress:
+    """
+    Progress record for a background import task.
+    
+    The import worker updates attributes in place; readers take a
+    snapshot when they need a payload.
+    """
+    progress: int = 0
+    current: int = 0
+    total: int = 0
+    status: str = ""
+    completed: bool = False
+    error: bool = False
+    cancelled: bool = False
+    imported: int = 0
+    
+    def snapshot(self) -> Dict:
+        """
+        Get the current progress as a plain dict.
+        
+        Returns:
+            Dict: Progress payload
+        """
+        return asdict(self)
+
+
 class ProductService:
     """Service class for product-related operations."""
     
+    # Target rows per Arrow record batch; bounds the rows held in memory
+    # and the rows written per import transaction
+    CSV_BLOCK_ROWS = 50_000
+    # Smallest block Arrow is asked to parse, in bytes
+    CSV_MIN_BLOCK_SIZE = 1 << 20
+    # Field order of the row tuples handed to the bulk writers
+    IMPORT_COLUMNS = ('name', 'sku', 'description', 'active')
+    # Rows written per insert batch during import
+    BATCH_SIZE = 10_000
+    # Bound parameters per statement on SQLite builds with the old default limit
+    SQLITE_MAX_VARIABLES = 999
+    # Read text columns as strings even when every value looks numeric
+    CSV_COLUMN_TYPES = {
+        'name': pa.string(),
+        'sku': pa.string(),
+        'description': pa.string()
+    }
+    # Keep parsed strings in Arrow buffers when handing batches to pandas
+    ARROW_STRING_DTYPES = {pa.string(): pd.StringDtype("pyarrow")}
+    
     @staticmethod
     def import_products_from_csv(
         file_path: str, 
         task_id: str, 
         progress_store: Dict,
-        cancel_flags: Dict
+        cancel_flags: Dict,
+        notify: Optional[Callable[[Dict], None]] = None
     ) -> Dict:
         """
         Import products from CSV file with progress tracking.
@@ -34,6 +93,7 @@ class ProductService:
             task_id (str): Unique task identifier for progress tracking
             progress_store (Dict): Shared progress storage
             cancel_flags (Dict): Shared cancellation flags
+            notify (Callable, optional): Called with every progress update
             
         Returns:
             Dict: Import result with status and statistics
@@ -41,95 +101,166 @@ class ProductService:
         db_session = SessionLocal()
         
         try:
-            # Load and validate CSV
-            progress_store[task_id] = {
-                "progress": 5, 
-                "status": "Loading CSV...", 
-                "completed": False
-            }
-            
-            df = pd.read_csv(file_path)
-            total_rows = len(df)
-            logger.info(f"Loaded CSV with {total_rows} rows")
-            
-            # Data preprocessing
-            progress_store[task_id] = {
-                "progress": 10, 
-                "status": "Preprocessing data...", 
-                "completed": False
-            }
-            
-            df = ProductService._preprocess_dataframe(df)
+            ProductService._set_progress(
+                progress_store, task_id, notify,
+                progress=5,
+                status="Loading CSV..."
+            )
             
-            # Get existing SKUs for deduplication
-            existing_skus = ProductService._get_existing_skus(db_session)
+            total_rows = ProductService._count_rows(file_path)
+            logger.info(f"Streaming CSV with {total_rows} rows")
             
-            # Process in batches
-            imported = ProductService._process_batches(
-                df, db_session, task_id, progress_store, 
-                cancel_flags, existing_skus
+            # Parse in Arrow record batches so memory stays bounded; Arrow
+            # reads ahead on its own threads while earlier batches are written
+            block_size = ProductService._block_size(file_path, total_rows)
+            reader = pacsv.open_csv(
+                file_path,
+                read_options=pacsv.ReadOptions(block_size=block_size),
+                convert_options=pacsv.ConvertOptions(
+                    column_types=ProductService.CSV_COLUMN_TYPES
+                )
             )
             
-            # Cleanup
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            imported = 0
+            processed = 0
+            for record_batch in reader:
+                df = ProductService._preprocess_dataframe(record_batch.to_pandas(
+                    types_mapper=ProductService.ARROW_STRING_DTYPES.get
+                ))
+                imported += ProductService._process_batches(
+                    df, db_session, task_id, progress_store, 
+                    cancel_flags, notify,
+                    offset=processed, total_rows=total_rows
+                )
+                processed += record_batch.num_rows
+                
+                # Also catches a cancel that arrived after the block's last
+                # batch, so the task is always marked finished
+                if cancel_flags.get(task_id, False):
+                    ProductService._set_progress(
+                        progress_store, task_id, notify,
+                        progress=0,
+                        status="Cancelled by user",
+                        completed=True,
+                        cancelled=True,
+                        imported=imported
+                    )
+                    return {
+                        "status": "cancelled",
+                        "imported": imported,
+                        "total_processed": processed
+                    }
             
-            progress_store[task_id] = {
-                "progress": 100,
-                "status": f"Completed! {imported} products imported",
-                "completed": True,
-                "imported": imported
-            }
+            ProductService._set_progress(
+                progress_store, task_id, notify,
+                progress=100,
+                status=f"Completed! {imported} products imported",
+                completed=True,
+                imported=imported
+            )
             
             logger.info(f"Import completed: {imported} new products imported")
             return {
                 "status": "completed", 
                 "imported": imported, 
-                "total_processed": total_rows
+                "total_processed": processed
             }
             
         except Exception as e:
             logger.error(f"Import failed: {str(e)}")
-            progress_store[task_id] = {
-                "progress": 0,
-                "status": f"Error: {str(e)}",
-                "completed": True,
-                "error": True
-            }
+            ProductService._set_progress(
+                progress_store, task_id, notify,
+                progress=0,
+                status=f"Error: {str(e)}",
+                completed=True,
+                error=True
+            )
             db_session.rollback()
             raise
         finally:
             db_session.close()
     
     @staticmethod
-    def _preprocess_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    def _count_rows(file_path: str) -> int:
         """
-        Preprocess the dataframe for import.
+        Count data rows in a CSV file without parsing it.
         
         Args:
-            df (pd.DataFrame): Raw dataframe from CSV
+            file_path (str): Path to the CSV file
             
         Returns:
-            pd.DataFrame: Preprocessed dataframe
+            int: Number of lines after the header
         """
-        # Remove duplicates and normalize SKUs
-        df = df.drop_duplicates(subset=['sku'], keep='last').copy()
-        df['sku'] = df['sku'].str.strip().str.lower()
-        return df
+        lines = 0
+        with open(file_path, 'rb') as f:
+            while chunk := f.read(1 << 20):
+                lines += chunk.count(b'\n')
+        return max(lines - 1, 0)
     
     @staticmethod
-    def _get_existing_skus(db_session: Session) -> Set[str]:
+    def _block_size(file_path: str, total_rows: int) -> int:
         """
-        Get all existing SKUs from database.
+        Size Arrow read blocks to hold about CSV_BLOCK_ROWS rows.
         
         Args:
-            db_session (Session): Database session
+            file_path (str): Path to the CSV file
+            total_rows (int): Number of data rows in the file
             
         Returns:
-            Set[str]: Set of existing SKUs
+            int: Block size in bytes
         """
-        result = db_session.execute(text("SELECT LOWER(sku) FROM products"))
-        return {row[0] for row in result}
+        avg_row_bytes = os.path.getsize(file_path) / max(total_rows, 1)
+        return max(
+            ProductService.CSV_MIN_BLOCK_SIZE,
+            int(avg_row_bytes * ProductService.CSV_BLOCK_ROWS)
+        )
+    
+    @staticmethod
+    def _set_progress(
+        progress_store: Dict,
+        task_id: str,
+        notify: Optional[Callable[[Dict], None]] = None,
+        **fields
+    ) -> None:
+        """
+        Update a task's progress record and forward a snapshot to the
+        subscriber, if any.
+        
+        Args:
+            progress_store (Dict): Shared progress storage
+            task_id (str): Task identifier
+            notify (Callable, optional): Progress subscriber callback
+            **fields: TaskProgress attributes to update
+        """
+        task = progress_store.get(task_id)
+        if task is None:
+            task = progress_store[task_id] = TaskProgress()
+        for name, value in fields.items():
+            setattr(task, name, value)
+        if notify is not None:
+            notify(task.snapshot())
+    
+    @staticmethod
+    def _preprocess_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Preprocess the dataframe for import.
+        
+        SKUs are normalized in place on the given dataframe. Rows whose SKU
+        is missing or blank are dropped, then duplicates are dropped keeping
+        the last occurrence.
+        
+        Args:
+            df (pd.DataFrame): Raw dataframe from CSV
+            
+        Returns:
+            pd.DataFrame: Preprocessed dataframe
+        """
+        # Normalize on Arrow string kernels, then dedup on the normalized SKU
+        df['sku'] = df['sku'].astype('string[pyarrow]').str.strip().str.lower()
+        # The reader hands empty cells over as '', not null; rows without a
+        # SKU can't be imported
+        df = df.loc[df['sku'].fillna('') != '']
+        return df.loc[~df['sku'].duplicated(keep='last')]
     
     @staticmethod
     def _process_batches(
@@ -138,74 +269,232 @@ class ProductService:
         task_id: str,
         progress_store: Dict,
         cancel_flags: Dict,
-        existing_skus: Set[str]
+        notify: Optional[Callable[[Dict], None]] = None,
+        offset: int = 0,
+        total_rows: Optional[int] = None
     ) -> int:
         """
         Process dataframe in batches for efficient import.
         
+        The whole dataframe, one Arrow block of about CSV_BLOCK_ROWS rows,
+        is written in a single transaction, committed once at the end. A
+        cancelled task stops early and keeps what was already written.
+        
         Args:
             df (pd.DataFrame): Preprocessed dataframe
             db_session (Session): Database session
             task_id (str): Task identifier
             progress_store (Dict): Progress storage
             cancel_flags (Dict): Cancellation flags
-            existing_skus (Set[str]): Existing SKUs to avoid duplicates
+            notify (Callable, optional): Called with every progress update
+            offset (int): Rows of the file processed before this dataframe
+            total_rows (int, optional): Rows in the whole file, for progress
             
         Returns:
             int: Number of products imported
         """
         imported = 0
-        batch_size = 5000
+        batch_size = ProductService.BATCH_SIZE
+        # Resolved once per frame rather than per batch; COPY goes through
+        # psycopg2's copy_expert, so other PostgreSQL drivers insert instead
+        dialect = db_session.get_bind().dialect
+        if dialect.name == "postgresql" and dialect.driver == "psycopg2":
+            write_products = ProductService._copy_products
+        else:
+            write_products = ProductService._insert_products
+        
+        # SKUs already stored, including ones from earlier batches of this
+        # file, are skipped by the unique index on insert. Row tuples in IMPORT_COLUMNS order, zipped once per frame straight
+        # from the column lists; batches are then plain list slices. Missing
+        # text is filled here; the reader already types it as strings
+        rows = list(zip(
+            df['name'].fillna('').tolist(),
+            df['sku'].tolist(),
+            df['description'].fillna('').tolist() if 'description' in df else repeat(''),
+            repeat(True)
+        ))
+        n_rows = len(rows)
+        total_rows = total_rows or offset + n_rows
         
-        for i in range(0, len(df), batch_size):
-            # Check for cancellation
+        for i in range(0, n_rows, batch_size):
+            # Check for cancellation; the caller marks the task cancelled
             if cancel_flags.get(task_id, False):
-                progress_store[task_id] = {
-                    "progress": 0,
-                    "status": "Cancelled by user",
-                    "completed": True,
-                    "cancelled": True
-                }
-                logger.info(f"Import cancelled at {i}/{len(df)} records")
+                db_session.commit()
+                logger.info(f"Import cancelled at {offset + i}/{total_rows} records")
                 return imported
             
-            batch = df.iloc[i:i+batch_size]
-            new_products = []
-            
-            # Prepare batch data
-            for _, row in batch.iterrows():
-                sku = str(row['sku']).lower()
-                if sku not in existing_skus:
-                    new_products.append({
-                        'name': str(row['name']),
-                        'sku': sku,
-                        'description': str(row.get('description', '')),
-                        'active': True
-                    })
-                    existing_skus.add(sku)
-                    imported += 1
-            
             # Bulk insert
-            if new_products:
-                db_session.execute(text("""
-                    INSERT INTO products (name, sku, description, active, created_at) 
-                    VALUES (:name, :sku, :description, :active, datetime('now'))
-                """), new_products)
-            
-            db_session.commit()
+            imported += write_products(db_session, rows[i:i+batch_size])
             
             # Update progress
-            progress = min(95, int((i + batch_size) / len(df) * 85) + 10)
-            progress_store[task_id] = {
-                "progress": progress,
-                "status": f"Processing... {i + batch_size}/{len(df)} ({imported} imported)",
-                "completed": False
-            }
+            done = min(offset + i + batch_size, total_rows)
+            progress = min(95, int(done / total_rows * 85) + 10)
+            ProductService._set_progress(
+                progress_store, task_id, notify,
+                progress=progress,
+                current=done,
+                total=total_rows,
+                status=f"Processing... {done}/{total_rows} ({imported} imported)"
+            )
             
-            logger.info(f"Progress: {progress}% ({i + batch_size}/{len(df)} processed, {imported} imported)")
+            logger.info(f"Progress: {progress}% ({done}/{total_rows} processed, {imported} imported)")
         
+        # One commit (and fsync) per block rather than per batch
+        db_session.commit()
         return imported
     
+    @staticmethod
+    def _insert_products(db_session: Session, products: List[Tuple]) -> int:
+        """
+        Bulk insert products, letting the database skip existing SKUs.
+        
+        Args:
+            db_session (Session): Database session
+            products (List[Tuple]): Product rows in IMPORT_COLUMNS order
+            
+        Returns:
+            int: Number of products inserted
+        """
+        dialect = db_session.get_bind().dialect.name
+        if dialect != "sqlite":
+            if dialect != "mysql":
+                # No portable conflict clause, so filter out stored SKUs first
+                products = ProductService._without_stored_skus(db_session, products)
+                if not products:
+                    return 0
+            # MySQL skips existing SKUs with INSERT IGNORE; one timestamp
+            # for the batch instead of a column default per row
+            stmt = (
+                Product.__table__.insert()
+                .prefix_with("IGNORE", dialect="mysql")
+                .values(created_at=datetime.utcnow())
+            )
+            columns = ProductService.IMPORT_COLUMNS
+            result = db_session.execute(stmt, [dict(zip(columns, row)) for row in products])
+            return result.rowcount
+        
+        # Multi-row VALUES statements, as many rows as the parameter limit
+        # allows; created_at is bound once per statement, after the rows
+        rows_per_statement = (
+            (ProductService.SQLITE_MAX_VARIABLES - 1) // len(ProductService.IMPORT_COLUMNS)
+        )
+        # Same text format SQLAlchemy's SQLite DateTime type stores
+        created_at = datetime.utcnow().isoformat(sep=' ', timespec='microseconds')
+        
+        connection = db_session.connection()
+        inserted = 0
+        for start in range(0, len(products), rows_per_statement):
+            chunk = products[start:start + rows_per_statement]
+            sql = ProductService._sqlite_insert_sql(len(chunk))
+            params = tuple(chain.from_iterable(chunk)) + (created_at,)
+            inserted += connection.exec_driver_sql(sql, params).rowcount
+        return inserted
+    
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _sqlite_insert_sql(rows: int) -> str:
+        """
+        Build the multi-row SQLite insert for a number of products.
+        
+        Cached so full-size chunks reuse one SQL string, which also keeps
+        hits in sqlite3's prepared statement cache. Placeholders are numbered
+        so every row can share the single created_at parameter at the end.
+        
+        Args:
+            rows (int): Number of product rows in the statement
+            
+        Returns:
+            str: INSERT statement with one placeholder group per row
+        """
+        width = len(ProductService.IMPORT_COLUMNS)
+        created_at = f"?{rows * width + 1}"
+        values = ", ".join(
+            "(" + ", ".join(f"?{row * width + field}" for field in range(1, width + 1))
+            + f", {created_at})"
+            for row in range(rows)
+        )
+        return (
+            f"INSERT INTO products ({', '.join(ProductService.IMPORT_COLUMNS)}, created_at) "
+            f"VALUES {values} ON CONFLICT (sku) DO NOTHING"
+        )
+    
+    @staticmethod
+    def _without_stored_skus(db_session: Session, products: List[Tuple]) -> List[Tuple]:
+        """
+        Drop products whose SKU is already stored.
+        
+        Used on databases without an insert conflict clause. SKUs are stored
+        lowercased, so plain equality against the unique index is enough.
+        
+        Args:
+            db_session (Session): Database session
+            products (List[Tuple]): Product rows in IMPORT_COLUMNS order
+            
+        Returns:
+            List[Tuple]: Rows whose SKU is not in the table yet
+        """
+        sku_index = ProductService.IMPORT_COLUMNS.index('sku')
+        skus = [product[sku_index] for product in products]
+        stored = set()
+        # Chunked to stay under bound parameter limits
+        for start in range(0, len(skus), 1000):
+            stored.update(db_session.scalars(
+                select(Product.sku).where(Product.sku.in_(skus[start:start + 1000]))
+            ))
+        return [product for product in products if product[sku_index] not in stored]
+    
+    @staticmethod
+    def _copy_products(db_session: Session, products: List[Tuple]) -> int:
+        """
+        Bulk load products into PostgreSQL with COPY.
+        
+        Rows are copied into a temporary staging table and then moved into
+        products, skipping SKUs that already exist. The import transaction
+        commits without waiting for the WAL flush; a crash can lose at most
+        the last few blocks, which a re-import restores since existing SKUs
+        are skipped.
+        
+        Args:
+            db_session (Session): Database session bound to PostgreSQL
+                through psycopg2
+            products (List[Tuple]): Product rows in IMPORT_COLUMNS order
+            
+        Returns:
+            int: Number of products inserted
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows(products)
+        buffer.seek(0)
+        
+        # Scoped to this batch's transaction only
+        db_session.execute(text("SET LOCAL synchronous_commit = off"))
+        db_session.execute(text("""
+            CREATE TEMP TABLE IF NOT EXISTS products_staging (
+                name VARCHAR, sku VARCHAR, description VARCHAR, active BOOLEAN
+            ) ON COMMIT DELETE ROWS
+        """))
+        cursor = db_session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                # Unquoted empty fields would otherwise load as NULL
+                "COPY products_staging (name, sku, description, active) "
+                "FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL (name, description))",
+                buffer
+            )
+        finally:
+            cursor.close()
+        
+        result = db_session.execute(text("""
+            INSERT INTO products (name, sku, description, active, created_at)
+            SELECT name, sku, description, active, now() AT TIME ZONE 'utc'
+            FROM products_staging
+            ON CONFLICT (sku) DO NOTHING
+        """))
+        # Several batches can share one transaction
+        db_session.execute(text("TRUNCATE products_staging"))
+        return result.rowcount
+    
     @staticmethod
     def get_products_paginated(
         db: Session,
@@ -230,7 +519,14 @@ class ProductService:
         query = db.query(Product)
         
         # Apply filters
-        if search:
+        if search and ProductService._use_search_index(db, search):
+            # Quoted as an FTS5 phrase so the term matches as a substring
+            phrase = '"' + search.replace('"', '""') + '"'
+            query = query.filter(text(
+                "products.id IN "
+                "(SELECT rowid FROM products_fts WHERE products_fts MATCH :search)"
+            ).bindparams(search=phrase))
+        elif search:
             query = query.filter(
                 (Product.name.ilike(f"%{search}%")) |
                 (Product.sku.ilike(f"%{search}%")) |
@@ -241,8 +537,14 @@ class ProductService:
             active_bool = active.lower() == 'true'
             query = query.filter(Product.active == active_bool)
         
-        total = query.count()
-        products = query.offset((page-1) * per_page).limit(per_page).all()
+        offset = (page-1) * per_page
+        products = query.offset(offset).limit(per_page).all()
+        
+        # A short page is the last one, so the total follows without a COUNT
+        if len(products) < per_page and (products or offset == 0):
+            total = offset + len(products)
+        else:
+            total = query.count()
         
         return {
             "products": products,
@@ -252,6 +554,49 @@ class ProductService:
             "total_pages": (total + per_page - 1) // per_page
         }
     
+    @staticmethod
+    def _use_search_index(db: Session, search: str) -> bool:
+        """
+        Check whether a search can use the SQLite trigram index.
+        
+        Trigrams need at least three characters; shorter terms, other
+        databases, and SQLite files whose products_fts table was never
+        created use ILIKE (trigram-indexed on PostgreSQL).
+        
+        Args:
+            db (Session): Database session
+            search (str): Search term
+            
+        Returns:
+            bool: True if the search should query products_fts
+        """
+        return (
+            SQLITE_TRIGRAM_SEARCH
+            and len(search) >= 3
+            and db.get_bind().dialect.name == "sqlite"
+            and ProductService._has_search_table(db.get_bind())
+        )
+    
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _has_search_table(engine: Engine) -> bool:
+        """
+        Check once per engine whether the products_fts table exists.
+        
+        It is created with the products table or by init_db, so a database
+        opened with migrations disabled may not have it.
+        
+        Args:
+            engine (Engine): SQLite engine
+            
+        Returns:
+            bool: True if products_fts exists
+        """
+        with engine.connect() as connection:
+            return connection.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'"
+            ).first() is not None
+    
     @staticmethod
     def create_product(
         db: Session,
@@ -273,20 +618,38 @@ class ProductService:
         Returns:
             Product: Created product
         """
-        # Check if SKU already exists
-        existing = db.query(Product).filter(Product.sku.ilike(sku)).first()
+        values = {
+            "name": name,
+            "sku": sku.lower(),
+            "description": description,
+            "active": active
+        }
+        dialect = db.get_bind().dialect
+        # RETURNING needs SQLite 3.35+; older builds use the check below
+        if dialect.name in ("sqlite", "postgresql") and dialect.insert_returning:
+            # Uniqueness check and insert in one round trip
+            insert = sqlite.insert if dialect.name == "sqlite" else postgresql.insert
+            stmt = (
+                insert(Product)
+                .values(**values)
+                .on_conflict_do_nothing(index_elements=["sku"])
+                .returning(Product)
+            )
+            product = db.scalars(stmt).first()
+            if product is None:
+                db.rollback()
+                raise ValueError(f"Product with SKU '{sku}' already exists")
+            db.commit()
+            return product
+        
+        # Check if SKU already exists; SKUs are stored lowercased
+        existing = db.query(Product.id).filter(Product.sku == values["sku"]).first()
         if existing:
             raise ValueError(f"Product with SKU '{sku}' already exists")
         
-        product = Product(
-            name=name,
-            sku=sku.lower(),
-            description=description,
-            active=active
-        )
+        product = Product(**values)
         db.add(product)
         db.commit()
-        db.refresh(product)
         return product
     
     @staticmethod
@@ -318,8 +681,8 @@ class ProductService:
         
         # Check SKU uniqueness if updating SKU
         if sku and sku.lower() != product.sku:
-            existing = db.query(Product).filter(
-                Product.sku.ilike(sku),
+            existing = db.query(Product.id).filter(
+                Product.sku == sku.lower(),
                 Product.id != product_id
             ).first()
             if existing:
@@ -336,7 +699,6 @@ class ProductService:
             product.active = active
         
         db.commit()
-        db.refresh(product)
         return product
     
     @staticmethod
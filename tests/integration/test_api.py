@@ -95,11 +95,55 @@ class TestProductAPI:
         assert data["inactive_products"] == 0
         assert data["database_status"] == "connected"
     
+    def test_get_status_counts_active_and_inactive(self, client):
+        """Test status endpoint splits active and inactive products."""
+        db = TestingSessionLocal()
+        try:
+            db.add_all([
+                Product(name="A", sku="status-a", active=True),
+                Product(name="B", sku="status-b", active=True),
+                Product(name="C", sku="status-c", active=False),
+            ])
+            db.commit()
+        finally:
+            db.close()
+        
+        data = client.get("/status").json()
+        assert data["total_products"] == 3
+        assert data["active_products"] == 2
+        assert data["inactive_products"] == 1
+    
     def test_get_products_empty(self, client):
         """Test getting products from empty database."""
         response = client.get("/products")
         assert response.status_code == 200
     
+    def test_products_page_reflects_new_product(self, client):
+        """Test cached products page is invalidated by product writes."""
+        first = client.get("/products")
+        assert "cache-sku-001" not in first.text
+        
+        response = client.post(
+            "/products",
+            data={"name": "Cached Product", "sku": "CACHE-SKU-001"}
+        )
+        assert response.status_code == 200
+        
+        second = client.get("/products")
+        assert "cache-sku-001" in second.text
+
+    def test_search_products_matches_substring(self, client):
+        """Test search matches terms in the middle of product fields."""
+        response = client.post(
+            "/products",
+            data={"name": "Searchable Widget", "sku": "SEARCH-SKU-001"}
+        )
+        assert response.status_code == 200
+
+        assert "search-sku-001" in client.get("/products?search=ABLE wid").text
+        assert "search-sku-001" in client.get("/products?search=h-sku").text
+        assert "search-sku-001" not in client.get("/products?search=gadget").text
+
     def test_delete_all_products_empty(self, client):
         """Test deleting all products from empty database."""
         response = client.delete("/products-all")
@@ -110,6 +154,24 @@ class TestProductAPI:
         assert data["deleted"] == 0
 
 
+class TestWebhookAPI:
+    """Integration tests for webhook API endpoints."""
+    
+    def test_webhook_page_gzip(self, client):
+        """Test webhook page is served gzip-encoded when accepted."""
+        response = client.get("/webhooks", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Webhook Management" in response.text
+    
+    def test_webhook_page_identity(self, client):
+        """Test webhook page is served uncompressed otherwise."""
+        response = client.get("/webhooks", headers={"Accept-Encoding": "identity"})
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        assert "Webhook Management" in response.text
+
+
 @pytest.fixture(autouse=True)
 def cleanup_database():
     """Clean up database after each test."""
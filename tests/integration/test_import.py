@@ -0,0 +1,153 @@
+"""
+Integration tests for CSV imports.
+
+This module runs ProductService.import_products_from_csv on real CSV
+files against a SQLite database.
+"""
+
+import pytest
+import pyarrow as pa
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Product
+from app.services import ProductService
+
+
+class CancelAfter(dict):
+    """Cancel flags that read False for a number of checks, then True."""
+    
+    def __init__(self, checks):
+        super().__init__()
+        self.checks = checks
+    
+    def get(self, key, default=None):
+        self.checks -= 1
+        return self.checks < 0
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Point imports at a fresh SQLite database."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'import.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    with patch("app.services.product_service.SessionLocal", factory):
+        yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def run_import(tmp_path, session_factory):
+    """Import CSV text and return the result and final progress record."""
+    def run(csv_text, cancel_flags=None, progress_store=None):
+        path = tmp_path / "products.csv"
+        path.write_text(csv_text)
+        progress_store = {} if progress_store is None else progress_store
+        updates = []
+        result = ProductService.import_products_from_csv(
+            str(path), "task-1", progress_store,
+            {} if cancel_flags is None else cancel_flags, updates.append
+        )
+        assert updates[-1] == progress_store["task-1"].snapshot()
+        return result, progress_store["task-1"]
+    return run
+
+
+def _stored(session_factory):
+    with session_factory() as db:
+        return {product.sku: product.name for product in db.query(Product)}
+
+
+class TestImportCancellation:
+    """Test cases for cancelling an import."""
+    
+    def test_cancel_after_last_batch_of_block(self, run_import, session_factory):
+        """Test a cancel seen only after the block's batches still finishes the task."""
+        result, task = run_import("name,sku\nA,a\nB,b\n", CancelAfter(1))
+        
+        assert result == {"status": "cancelled", "imported": 2, "total_processed": 2}
+        assert task.completed is True
+        assert task.cancelled is True
+        assert task.status == "Cancelled by user"
+        assert _stored(session_factory) == {"a": "A", "b": "B"}
+    
+    def test_cancel_between_batches(self, run_import, session_factory):
+        """Test a cancel mid-block keeps the batches already written."""
+        with patch.object(ProductService, "BATCH_SIZE", 2):
+            result, task = run_import(
+                "name,sku\nA,a\nB,b\nC,c\nD,d\nE,e\n", CancelAfter(1)
+            )
+        
+        assert result["status"] == "cancelled"
+        assert result["imported"] == 2
+        assert task.completed is True
+        assert task.cancelled is True
+        assert _stored(session_factory) == {"a": "A", "b": "B"}
+
+
+class TestImportRows:
+    """Test cases for which CSV rows are imported."""
+    
+    def test_import_counts_and_completion(self, run_import, session_factory):
+        """Test a plain import stores every row and finishes the task."""
+        rows = "".join(f"Product {i},SKU-{i},Desc {i}\n" for i in range(25))
+        
+        result, task = run_import("name,sku,description\n" + rows)
+        
+        assert result == {"status": "completed", "imported": 25, "total_processed": 25}
+        assert task.completed is True
+        assert task.error is False
+        assert task.progress == 100
+        assert task.imported == 25
+        stored = _stored(session_factory)
+        assert len(stored) == 25
+        assert stored["sku-7"] == "Product 7"
+    
+    def test_duplicates_within_block_keep_last(self, run_import, session_factory):
+        """Test SKUs repeated in one block keep the last row."""
+        result, _ = run_import("name,sku\nFirst,DUP\nOther,x\nLast, dup \n")
+        
+        assert result == {"status": "completed", "imported": 2, "total_processed": 3}
+        assert _stored(session_factory) == {"dup": "Last", "x": "Other"}
+    
+    def test_duplicates_across_blocks_and_imports(self, run_import, session_factory):
+        """Test SKUs seen in an earlier block or import are skipped."""
+        rows = "".join(f"Product {i},SKU-{i % 10}\n" for i in range(30))
+        with patch.object(ProductService, "CSV_BLOCK_ROWS", 4), \
+                patch.object(ProductService, "CSV_MIN_BLOCK_SIZE", 1), \
+                patch.object(ProductService, "_process_batches",
+                             wraps=ProductService._process_batches) as process:
+            result, task = run_import("name,sku\n" + rows)
+        
+        assert process.call_count > 1
+        assert result == {"status": "completed", "imported": 10, "total_processed": 30}
+        assert task.completed is True
+        stored = _stored(session_factory)
+        assert len(stored) == 10
+        # The first block holding a SKU wins
+        assert stored["sku-3"] == "Product 3"
+        
+        result, _ = run_import("name,sku\nAgain,SKU-3\nNew,SKU-99\n")
+        assert result["imported"] == 1
+        assert _stored(session_factory)["sku-3"] == "Product 3"
+    
+    def test_blank_skus_are_skipped(self, run_import, session_factory):
+        """Test empty and whitespace-only SKU cells are not imported."""
+        result, task = run_import("name,sku,description\nEmpty,,x\nBlank,   ,y\nKept,K-1,z\n")
+        
+        assert result == {"status": "completed", "imported": 1, "total_processed": 3}
+        assert task.completed is True
+        assert _stored(session_factory) == {"k-1": "Kept"}
+    
+    def test_malformed_csv_marks_task_failed(self, run_import):
+        """Test a parse error finishes the task with an error."""
+        progress_store = {}
+        with pytest.raises(pa.ArrowInvalid):
+            run_import("name,sku\nA,a,extra\n", progress_store=progress_store)
+        
+        task = progress_store["task-1"]
+        assert task.completed is True
+        assert task.error is True
+        assert task.status.startswith("Error: ")
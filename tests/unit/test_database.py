@@ -0,0 +1,87 @@
+"""
+Unit tests for database setup.
+
+This module contains unit tests for the schema and data upkeep that
+runs from init_db.
+"""
+
+import pytest
+from unittest.mock import Mock
+from sqlalchemy import create_engine, text
+
+from app.models import Base
+from app.models.database import _lowercase_skus, _run_once
+
+
+@pytest.fixture
+def engine():
+    """Create an in-memory database with the application schema."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def _insert_skus(engine, skus):
+    with engine.begin() as connection:
+        for sku in skus:
+            connection.execute(
+                text("INSERT INTO products (name, sku, active) VALUES ('p', :sku, 1)"),
+                {"sku": sku}
+            )
+
+
+def _stored_skus(engine):
+    with engine.connect() as connection:
+        return connection.execute(text("SELECT sku FROM products ORDER BY id")).scalars().all()
+
+
+class TestLowercaseSkus:
+    """Test cases for the legacy SKU backfill."""
+    
+    def test_lowercases_mixed_case_skus(self, engine):
+        """Test SKUs without a case-insensitive sibling are lowercased."""
+        _insert_skus(engine, ['XYZ', 'abc', 'Def'])
+        
+        with engine.begin() as connection:
+            _lowercase_skus(connection)
+        
+        assert _stored_skus(engine) == ['xyz', 'abc', 'def']
+    
+    def test_case_collisions_keep_one_lowercase_row(self, engine):
+        """Test SKUs differing only by case don't block the rest of the backfill."""
+        _insert_skus(engine, ['ABC', 'Abc', 'XYZ', 'dup', 'DUP'])
+        
+        with engine.begin() as connection:
+            _lowercase_skus(connection)
+        
+        assert _stored_skus(engine) == ['abc', 'Abc', 'xyz', 'dup', 'DUP']
+
+
+class TestRunOnce:
+    """Test cases for one-off data migrations."""
+    
+    def test_migration_runs_only_once(self, engine):
+        """Test a recorded migration is skipped on later startups."""
+        migration = Mock()
+        
+        for _ in range(2):
+            with engine.begin() as connection:
+                _run_once(connection, "example", migration)
+        
+        migration.assert_called_once()
+        with engine.connect() as connection:
+            names = connection.execute(text("SELECT name FROM schema_migrations")).scalars().all()
+        assert names == ["example"]
+    
+    def test_failed_migration_is_retried(self, engine):
+        """Test a migration that raised is not recorded as applied."""
+        migration = Mock(side_effect=[RuntimeError("boom"), None])
+        
+        with pytest.raises(RuntimeError):
+            with engine.begin() as connection:
+                _run_once(connection, "example", migration)
+        with engine.begin() as connection:
+            _run_once(connection, "example", migration)
+        
+        assert migration.call_count == 2
@@ -8,10 +8,22 @@ testing business logic and data processing functions.
 import pytest
 import pandas as pd
 from unittest.mock import Mock, patch, MagicMock
+from sqlalchemy import create_engine
 from sqlalchemy.orm import Session
 
-from app.services.product_service import ProductService
-from app.models import Product
+from app.services.product_service import ProductService, TaskProgress
+from app.models import Base, Product
+
+
+@pytest.fixture
+def sqlite_db():
+    """Create a session on an in-memory SQLite database."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = Session(engine)
+    yield db
+    db.close()
+    engine.dispose()
 
 
 class TestProductService:
@@ -39,20 +51,177 @@ class TestProductService:
         sku_001_row = result[result['sku'] == 'sku-001']
         assert sku_001_row['description'].iloc[0] == 'Desc A Updated'
     
-    @patch('app.services.product_service.text')
-    def test_get_existing_skus(self, mock_text):
-        """Test getting existing SKUs from database."""
-        # Mock database session and result
-        mock_session = Mock(spec=Session)
-        mock_result = [('sku-001',), ('sku-002',), ('sku-003',)]
-        mock_session.execute.return_value = mock_result
+    def test_preprocess_dataframe_dedups_normalized_skus(self):
+        """Test SKUs differing only by case or whitespace count as duplicates."""
+        df = pd.DataFrame({
+            'name': ['Product A', 'Product A2'],
+            'sku': [' SKU-001 ', 'sku-001'],
+            'description': ['First', 'Second']
+        })
         
-        # Call method
-        result = ProductService._get_existing_skus(mock_session)
+        result = ProductService._preprocess_dataframe(df)
         
-        # Assertions
-        assert result == {'sku-001', 'sku-002', 'sku-003'}
-        mock_session.execute.assert_called_once()
+        assert result['sku'].tolist() == ['sku-001']
+        assert result['description'].iloc[0] == 'Second'
+    
+    def test_preprocess_dataframe_drops_blank_skus(self):
+        """Test rows whose SKU is missing, empty or only whitespace are dropped."""
+        df = pd.DataFrame({
+            'name': ['Missing', 'Empty', 'Blank', 'Kept'],
+            'sku': [None, '', '   ', 'SKU-001']
+        })
+        
+        result = ProductService._preprocess_dataframe(df)
+        
+        assert result['name'].tolist() == ['Kept']
+        assert result['sku'].tolist() == ['sku-001']
+    
+    def test_set_progress_updates_record_and_notifies(self):
+        """Test progress updates mutate the task record and push snapshots."""
+        progress_store = {}
+        updates = []
+        
+        ProductService._set_progress(
+            progress_store, 'task-1', updates.append,
+            progress=50, status="Halfway"
+        )
+        task = progress_store['task-1']
+        ProductService._set_progress(
+            progress_store, 'task-1', updates.append,
+            progress=100, completed=True
+        )
+        
+        # Same record is updated in place
+        assert progress_store['task-1'] is task
+        assert isinstance(task, TaskProgress)
+        assert task.status == "Halfway"
+        # Subscribers receive independent snapshots
+        assert updates[0]['progress'] == 50
+        assert updates[0]['completed'] is False
+        assert updates[1]['progress'] == 100
+        assert updates[1]['completed'] is True
+    
+    @patch.object(ProductService, '_insert_products')
+    def test_process_batches_inserts_rows_with_sku(self, mock_insert):
+        """Test batch processing builds insert rows in IMPORT_COLUMNS order."""
+        mock_session = MagicMock(spec=Session)
+        mock_session.get_bind.return_value.dialect.name = 'sqlite'
+        mock_insert.side_effect = lambda session, rows: len(rows)
+        df = pd.DataFrame({
+            'name': ['Product A', None],
+            'sku': ['sku-001', 'sku-003']
+        })
+        
+        imported = ProductService._process_batches(
+            df, mock_session, 'task-1', {}, {}
+        )
+        
+        assert imported == 2
+        rows = mock_insert.call_args[0][1]
+        assert rows == [('Product A', 'sku-001', '', True), ('', 'sku-003', '', True)]
+        mock_session.commit.assert_called_once()
+    
+    @pytest.mark.parametrize("driver, writer", [
+        ('psycopg2', '_copy_products'),
+        ('psycopg', '_insert_products'),
+        ('pg8000', '_insert_products'),
+    ])
+    def test_process_batches_uses_copy_only_with_psycopg2(self, driver, writer):
+        """Test COPY is used only on the driver that provides copy_expert."""
+        mock_session = MagicMock(spec=Session)
+        dialect = mock_session.get_bind.return_value.dialect
+        dialect.name = 'postgresql'
+        dialect.driver = driver
+        df = pd.DataFrame({'name': ['Product A'], 'sku': ['sku-001']})
+        
+        with patch.object(ProductService, '_copy_products', return_value=1) as copy, \
+                patch.object(ProductService, '_insert_products', return_value=1) as insert:
+            ProductService._process_batches(df, mock_session, 'task-1', {}, {})
+        
+        used = copy if writer == '_copy_products' else insert
+        unused = insert if used is copy else copy
+        used.assert_called_once()
+        unused.assert_not_called()
+    
+    def test_sqlite_insert_sql_numbered_placeholders(self):
+        """Test every row of the SQLite insert shares the trailing created_at."""
+        sql = ProductService._sqlite_insert_sql(2)
+        
+        assert sql == (
+            "INSERT INTO products (name, sku, description, active, created_at) "
+            "VALUES (?1, ?2, ?3, ?4, ?9), (?5, ?6, ?7, ?8, ?9) "
+            "ON CONFLICT (sku) DO NOTHING"
+        )
+    
+    def test_insert_products_skips_duplicate_skus(self, sqlite_db):
+        """Test SKUs already stored or repeated in the batch are skipped."""
+        sqlite_db.add(Product(name="Stored", sku="sku-001"))
+        sqlite_db.commit()
+        rows = [
+            ('Product A', 'sku-001', '', True),
+            ('Product B', 'sku-002', '', True),
+            ('Product B again', 'sku-002', '', True),
+            ('Product C', 'sku-003', 'Desc C', True),
+        ]
+        
+        inserted = ProductService._insert_products(sqlite_db, rows)
+        sqlite_db.commit()
+        
+        assert inserted == 2
+        stored = {product.sku: product.name for product in sqlite_db.query(Product)}
+        assert stored == {
+            'sku-001': 'Stored', 'sku-002': 'Product B', 'sku-003': 'Product C'
+        }
+    
+    def test_insert_products_splits_past_variable_limit(self, sqlite_db):
+        """Test a batch needing more parameters than SQLite allows is split."""
+        rows = [
+            (f'Product {i}', f'sku-{i:04d}', '', True)
+            for i in range(ProductService.SQLITE_MAX_VARIABLES)
+        ]
+        
+        with patch.object(
+            ProductService, '_sqlite_insert_sql', wraps=ProductService._sqlite_insert_sql
+        ) as build_sql:
+            inserted = ProductService._insert_products(sqlite_db, rows)
+        sqlite_db.commit()
+        
+        chunk_rows = [call.args[0] for call in build_sql.call_args_list]
+        assert len(chunk_rows) > 1
+        assert max(chunk_rows) * 4 + 1 <= ProductService.SQLITE_MAX_VARIABLES
+        assert sum(chunk_rows) == len(rows)
+        assert inserted == len(rows)
+        assert sqlite_db.query(Product).count() == len(rows)
+        assert sqlite_db.query(Product.created_at).distinct().count() == 1
+    
+    def test_without_stored_skus(self, sqlite_db):
+        """Test the pre-insert filter drops only SKUs already stored."""
+        sqlite_db.add(Product(name="Stored", sku="sku-001"))
+        sqlite_db.commit()
+        rows = [('Product A', 'sku-001', '', True), ('Product B', 'sku-002', '', True)]
+        
+        assert ProductService._without_stored_skus(sqlite_db, rows) == rows[1:]
+    
+    def test_copy_products(self):
+        """Test COPY loads CSV rows through staging and reports inserted rows."""
+        mock_session = MagicMock(spec=Session)
+        cursor = mock_session.connection.return_value.connection.cursor.return_value
+        copied = {}
+        cursor.copy_expert.side_effect = lambda sql, buffer: copied.update(
+            sql=sql, data=buffer.read()
+        )
+        mock_session.execute.return_value.rowcount = 1
+        rows = [('Product A', 'sku-001', '', True), ('Product, B', 'sku-002', 'x', True)]
+        
+        inserted = ProductService._copy_products(mock_session, rows)
+        
+        assert inserted == 1
+        assert "FORCE_NOT_NULL (name, description)" in copied['sql']
+        assert copied['data'] == 'Product A,sku-001,,True\r\n"Product, B",sku-002,x,True\r\n'
+        cursor.close.assert_called_once()
+        statements = [str(call.args[0]) for call in mock_session.execute.call_args_list]
+        assert "ON CONFLICT (sku) DO NOTHING" in statements[-2]
+        assert statements[-1] == "TRUNCATE products_staging"
     
     def test_get_products_paginated_no_filters(self):
         """Test getting paginated products without filters."""
@@ -96,6 +265,60 @@ class TestProductService:
         assert result['total'] == 10
         assert len(result['products']) == 10
         mock_query.filter.assert_called_once()
+        # A short first page already gives the total
+        mock_query.count.assert_not_called()
+    
+    def test_get_products_paginated_search_without_search_table(self, sqlite_db):
+        """Test search falls back to ILIKE when products_fts is missing."""
+        sqlite_db.add(Product(name="Blue Widget", sku="widget-001"))
+        sqlite_db.commit()
+        connection = sqlite_db.connection()
+        for trigger in ("insert", "delete", "update"):
+            connection.exec_driver_sql(f"DROP TRIGGER products_fts_{trigger}")
+        connection.exec_driver_sql("DROP TABLE products_fts")
+        
+        result = ProductService.get_products_paginated(sqlite_db, search="widget")
+        
+        assert [product.sku for product in result['products']] == ["widget-001"]
+    
+    def test_get_products_paginated_past_last_page(self):
+        """Test an empty page past the end still reports the real total."""
+        mock_db = Mock(spec=Session)
+        mock_query = Mock()
+        mock_db.query.return_value = mock_query
+        mock_query.count.return_value = 30
+        mock_query.offset.return_value = mock_query
+        mock_query.limit.return_value = mock_query
+        mock_query.all.return_value = []
+        
+        result = ProductService.get_products_paginated(mock_db, page=5, per_page=20)
+        
+        assert result['total'] == 30
+        assert result['total_pages'] == 2
+        assert result['products'] == []
+    
+    def test_create_product_duplicate_sku(self, sqlite_db):
+        """Test creating a product with a stored SKU raises on the RETURNING path."""
+        assert sqlite_db.get_bind().dialect.insert_returning
+        ProductService.create_product(sqlite_db, name="First", sku="DUP-001")
+        
+        with pytest.raises(ValueError, match="already exists"):
+            ProductService.create_product(sqlite_db, name="Second", sku="dup-001")
+        
+        assert sqlite_db.query(Product).count() == 1
+    
+    def test_create_product_without_insert_returning(self, sqlite_db):
+        """Test SQLite builds without RETURNING fall back to an equality check."""
+        dialect = sqlite_db.get_bind().dialect
+        with patch.object(dialect, "insert_returning", False), \
+                patch("app.services.product_service.sqlite.insert") as mock_insert:
+            product = ProductService.create_product(sqlite_db, name="First", sku="SKU-001")
+            with pytest.raises(ValueError, match="already exists"):
+                ProductService.create_product(sqlite_db, name="Second", sku="sku-001")
+        
+        mock_insert.assert_not_called()
+        assert product.sku == "sku-001"
+        assert sqlite_db.query(Product).count() == 1
     
     def test_delete_all_products(self):
         """Test deleting all products."""
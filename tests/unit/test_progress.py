@@ -0,0 +1,124 @@
+"""
+Unit tests for import progress tracking.
+
+This module contains unit tests for the progress channels behind the
+/progress SSE stream and for the cleanup of finished tasks.
+"""
+
+import asyncio
+import io
+
+import orjson
+import pytest
+from unittest.mock import patch
+from fastapi import UploadFile
+
+from app.api import products as products_api
+
+
+async def _read_stream(task_id):
+    response = await products_api.get_progress_stream(task_id)
+    frames = []
+    async for frame in response.body_iterator:
+        if frame.startswith(b"data: "):
+            frames.append(orjson.loads(frame[len(b"data: "):]))
+    return frames
+
+
+@pytest.fixture
+def task_id():
+    """Register a progress channel for a task and drop it afterwards."""
+    task_id = "task-1"
+    products_api.progress_channels[task_id] = products_api.ProgressChannel()
+    yield task_id
+    products_api._forget_task(task_id)
+
+
+class TestProgressChannel:
+    """Test cases for progress publishing and SSE subscribers."""
+    
+    @pytest.mark.asyncio
+    async def test_every_subscriber_sees_final_state(self, task_id):
+        """Test concurrent and late subscribers all receive the completed frame."""
+        subscribers = [asyncio.create_task(_read_stream(task_id)) for _ in range(2)]
+        await asyncio.sleep(0)
+        
+        for progress in range(0, 100, 10):
+            products_api._publish_progress(task_id, progress=progress)
+        products_api._publish_progress(task_id, progress=100, completed=True)
+        
+        for frames in await asyncio.gather(*subscribers):
+            assert frames[-1]["completed"] is True
+            assert frames[-1]["progress"] == 100
+        # The final state stays readable for a subscriber that arrives late
+        late = await _read_stream(task_id)
+        assert late == [frames[-1]]
+    
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_skips_to_latest(self, task_id):
+        """Test updates published between reads collapse into the newest one."""
+        channel = products_api.progress_channels[task_id]
+        for progress in range(1, 1000):
+            products_api._publish_progress(task_id, progress=progress)
+        
+        assert channel.snapshot["progress"] == 999
+        products_api._publish_progress(task_id, completed=True)
+        frames = await _read_stream(task_id)
+        assert len(frames) == 1
+    
+    @pytest.mark.asyncio
+    async def test_idle_stream_sends_keepalive(self, task_id):
+        """Test a stream with no new progress sends keepalive comments."""
+        products_api._publish_progress(task_id, progress=10)
+        with patch.object(products_api, "SSE_KEEPALIVE_INTERVAL", 0.01):
+            response = await products_api.get_progress_stream(task_id)
+            stream = response.body_iterator
+            assert (await stream.__anext__()).startswith(b"data: ")
+            assert await stream.__anext__() == b": keepalive\n\n"
+            await stream.aclose()
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("cancelled, status", [
+        (True, "Cancelled by user"),
+        (False, "Error: import stopped"),
+    ])
+    async def test_unfinished_import_is_settled(self, cancelled, status):
+        """Test a worker that returns without finishing the task still ends the stream."""
+        def fake_import(file_path, task_id, progress_store, cancel_flags, notify):
+            cancel_flags[task_id] = cancelled
+            return {"status": "cancelled" if cancelled else "completed"}
+        
+        upload = UploadFile(io.BytesIO(b"name,sku\nA,a\n"), filename="products.csv")
+        with patch.object(products_api.ProductService, "import_products_from_csv", fake_import):
+            task_id = (await products_api.upload_file_direct(upload))["task_id"]
+            try:
+                frames = await asyncio.wait_for(_read_stream(task_id), timeout=5)
+            finally:
+                products_api._forget_task(task_id)
+        
+        assert frames[-1]["completed"] is True
+        assert frames[-1]["cancelled"] is cancelled
+        assert frames[-1]["error"] is not cancelled
+        assert frames[-1]["status"] == status
+    
+    @pytest.mark.asyncio
+    async def test_finished_task_is_forgotten(self):
+        """Test a task's progress is dropped after the retention period."""
+        def fake_import(file_path, task_id, progress_store, cancel_flags, notify):
+            notify({"progress": 100, "completed": True})
+            return {"status": "completed"}
+        
+        upload = UploadFile(io.BytesIO(b"name,sku\nA,a\n"), filename="products.csv")
+        with patch.object(products_api, "PROGRESS_RETENTION_SECONDS", 0), \
+                patch.object(products_api.ProductService, "import_products_from_csv", fake_import):
+            result = await products_api.upload_file_direct(upload)
+            task_id = result["task_id"]
+            assert task_id in products_api.progress_channels
+        
+            for _ in range(100):
+                if task_id not in products_api.progress_channels:
+                    break
+                await asyncio.sleep(0.01)
+        
+        assert task_id not in products_api.progress_channels
+        assert task_id not in products_api.progress_store
@@ -0,0 +1,67 @@
+"""
+Unit tests for webhook event delivery.
+
+This module contains unit tests for dispatch_event, with the shared
+HTTP client mocked out.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+import httpx
+
+from app.api import webhooks as webhooks_api
+
+
+@pytest.fixture
+def registered_webhooks():
+    """Register webhooks for the duration of a test."""
+    with patch.dict(webhooks_api.webhooks, clear=True):
+        webhooks_api.webhooks.update({
+            1: {"id": 1, "url": "http://one/hook", "event_types": ["product.created"], "enabled": True},
+            2: {"id": 2, "url": "http://two/hook", "event_types": ["product.created"], "enabled": True},
+            3: {"id": 3, "url": "http://off/hook", "event_types": ["product.created"], "enabled": False},
+            4: {"id": 4, "url": "http://other/hook", "event_types": ["product.deleted"], "enabled": True},
+        })
+        yield webhooks_api.webhooks
+
+
+class TestDispatchEvent:
+    """Test cases for dispatch_event."""
+    
+    @pytest.mark.asyncio
+    async def test_delivers_to_enabled_matching_webhooks(self, registered_webhooks):
+        """Test only enabled webhooks subscribed to the event are called."""
+        with patch.object(webhooks_api, "http_client") as mock_client:
+            mock_client.post = AsyncMock()
+            await webhooks_api.dispatch_event("product.created", {"id": 7})
+        
+        urls = sorted(call.args[0] for call in mock_client.post.call_args_list)
+        assert urls == ["http://one/hook", "http://two/hook"]
+        payload = mock_client.post.call_args.kwargs["json"]
+        assert payload["event"] == "product.created"
+        assert payload["data"] == {"id": 7}
+    
+    @pytest.mark.asyncio
+    async def test_failing_endpoint_does_not_stop_others(self, registered_webhooks, caplog):
+        """Test a delivery error is logged and the other webhooks still get the event."""
+        async def post(url, **kwargs):
+            if url == "http://one/hook":
+                raise httpx.ConnectError("refused")
+        
+        with patch.object(webhooks_api, "http_client") as mock_client:
+            mock_client.post = AsyncMock(side_effect=post)
+            await webhooks_api.dispatch_event("product.created", {"id": 7})
+        
+        urls = sorted(call.args[0] for call in mock_client.post.call_args_list)
+        assert urls == ["http://one/hook", "http://two/hook"]
+        assert "Webhook 1 delivery failed" in caplog.text
+    
+    @pytest.mark.asyncio
+    async def test_no_subscribers(self, registered_webhooks):
+        """Test events nobody subscribes to make no requests."""
+        with patch.object(webhooks_api, "http_client") as mock_client:
+            mock_client.post = AsyncMock()
+            await webhooks_api.dispatch_event("product.updated", {"id": 7})
+        
+        mock_client.post.assert_not_called()
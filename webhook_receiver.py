@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
-from http.server import HTTPServer, BaseHTTPRequestHandler
-import json
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import orjson
 from datetime import datetime
 
 class WebhookHandler(BaseHTTPRequestHandler):
@@ -8,18 +8,21 @@ class WebhookHandler(BaseHTTPRequestHandler):
         content_length = int(self.headers['Content-Length'])
         post_data = self.rfile.read(content_length)
         
-        print(f"\n{'='*50}")
-        print(f"Webhook received at {datetime.now()}")
-        print(f"URL: {self.path}")
-        print(f"Headers: {dict(self.headers)}")
-        
         try:
-            data = json.loads(post_data.decode('utf-8'))
-            print(f"Data: {json.dumps(data, indent=2)}")
-        except:
-            print(f"Raw data: {post_data.decode('utf-8')}")
+            data = orjson.loads(post_data)
+            body = f"Data: {orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()}"
+        except orjson.JSONDecodeError:
+            body = f"Raw data: {post_data.decode('utf-8', errors='replace')}"
         
-        print(f"{'='*50}\n")
+        # One print per delivery so concurrent requests don't interleave
+        print(
+            f"\n{'='*50}\n"
+            f"Webhook received at {datetime.now()}\n"
+            f"URL: {self.path}\n"
+            f"Headers: {dict(self.headers)}\n"
+            f"{body}\n"
+            f"{'='*50}\n"
+        )
         
         # Send response
         self.send_response(200)
@@ -31,7 +34,8 @@ class WebhookHandler(BaseHTTPRequestHandler):
         pass  # Suppress default logging
 
 if __name__ == '__main__':
-    server = HTTPServer(('localhost', 8001), WebhookHandler)
+    # A thread per request, so one slow sender doesn't hold up the others
+    server = ThreadingHTTPServer(('localhost', 8001), WebhookHandler)
     print("Webhook receiver running on http://localhost:8001")
     print("Use this URL in your webhook settings (with ngrok if needed)")
     server.serve_forever()